@@ -0,0 +1,64 @@
+import time
+
+import pytest
+
+from tiledb.ml.readers._prefetch import PrefetchIterator
+
+
+class TestPrefetchIterator:
+    @pytest.mark.parametrize("buffer_size", [1, 2, 5, 100])
+    def test_order(self, buffer_size):
+        items = list(range(50))
+        assert list(PrefetchIterator(iter(items), buffer_size)) == items
+
+    def test_empty(self):
+        it = PrefetchIterator(iter([]), 2)
+        assert list(it) == []
+        # exhausted iterator keeps raising StopIteration
+        assert list(it) == []
+
+    def test_bounded(self):
+        produced = []
+
+        def gen():
+            for i in range(10):
+                produced.append(i)
+                yield i
+
+        it = PrefetchIterator(gen(), 3)
+        assert next(it) == 0
+        # give the producer time to fill the buffer
+        time.sleep(0.2)
+        # 1 consumed, 3 buffered and (at most) 1 blocked on the full buffer
+        assert len(produced) <= 5
+        assert list(it) == list(range(1, 10))
+
+    def test_error(self):
+        def gen():
+            yield 1
+            yield 2
+            raise ZeroDivisionError("boom")
+
+        it = PrefetchIterator(gen(), 2)
+        assert next(it) == 1
+        assert next(it) == 2
+        with pytest.raises(ZeroDivisionError) as ex:
+            next(it)
+        assert "boom" in str(ex.value)
+        with pytest.raises(StopIteration):
+            next(it)
+
+    def test_close(self):
+        it = PrefetchIterator(iter(range(1000)), 2)
+        assert next(it) == 0
+        it.close()
+        with pytest.raises(StopIteration):
+            next(it)
+        it._thread.join(1)
+        assert not it._thread.is_alive()
+
+    @pytest.mark.parametrize("buffer_size", [0, -1])
+    def test_invalid_buffer_size(self, buffer_size):
+        with pytest.raises(ValueError) as ex:
+            PrefetchIterator(iter([]), buffer_size)
+        assert "Buffer size must be positive" in str(ex.value)
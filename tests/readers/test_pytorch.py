@@ -6,7 +6,13 @@ import pytest
 import torch
 import torchdata
 
-from tiledb.ml.readers.pytorch import PyTorchTileDBDataLoader, TensorKind
+from tiledb.ml.readers._tensor_schema.ranges import WeightedRange
+from tiledb.ml.readers._tensor_schema.sparse import SparseTensorSchema
+from tiledb.ml.readers.pytorch import (
+    PyTorchTileDBDataLoader,
+    TensorKind,
+    _iter_shuffled,
+)
 
 from .utils import (
     ArraySpec,
@@ -141,3 +147,154 @@ class TestPyTorchTileDBDataLoader:
             assert_tensors_almost_equal_array(
                 batches, data, params.tensor_schema.kind, batch_size, to_dense
             )
+
+    @pytest.mark.parametrize("batch_size", [8, None])
+    @pytest.mark.parametrize("float_dtype", [None, torch.float16])
+    def test_1d_dense(self, tmpdir, batch_size, float_dtype):
+        """Test loading a 1D dense array (e.g. labels), whose rows are Numpy scalars."""
+        x_spec, y_spec = (
+            ArraySpec(
+                sparse=False,
+                shape=shape,
+                key_dim=0,
+                key_dim_dtype=np.dtype(np.int32),
+                non_key_dim_dtype=np.dtype(np.int32),
+                num_fields=0,
+                tensor_kind=None,
+            )
+            for shape in ((107, 10), (107,))
+        )
+        with ingest_in_tiledb(tmpdir, x_spec) as (x_params, x_data):
+            with ingest_in_tiledb(tmpdir, y_spec) as (y_params, y_data):
+                dataloader = PyTorchTileDBDataLoader(
+                    x_params, y_params, batch_size=batch_size, float_dtype=float_dtype
+                )
+                # since num_fields is 0, fields are all the array attributes of each
+                # array: the first item of the tensors of each array is "data"
+                y_batches = [y_tensors[0] for _, y_tensors in dataloader]
+
+        for y_batch in y_batches:
+            assert y_batch.shape == ((len(y_batch),) if batch_size else ())
+            assert y_batch.dtype is (float_dtype or torch.float32)
+        y_tensor = torch.cat(y_batches) if batch_size else torch.stack(y_batches)
+        np.testing.assert_allclose(y_tensor.float(), y_data, rtol=1e-2)
+
+    @pytest.mark.parametrize("shuffle_buffer_size", [0, 16])
+    @pytest.mark.parametrize("shuffle_strategy", ["buffer", "partitions"])
+    def test_dense_and_sparse(
+        self, tmpdir, mocker, shuffle_buffer_size, shuffle_strategy
+    ):
+        """Test loading aligned rows from a dense and a sparse array.
+
+        Each array must be partitioned by its own maximum partition weight: a number of
+        rows for the dense array and a number of cells for the sparse one.
+        """
+        x_spec, y_spec = (
+            ArraySpec(
+                sparse=sparse,
+                shape=(107, 10),
+                key_dim=0,
+                key_dim_dtype=np.dtype(np.int32),
+                non_key_dim_dtype=np.dtype(np.int32),
+                num_fields=0,
+                tensor_kind=None,
+            )
+            for sparse in (False, True)
+        )
+        # each sparse row has a single cell, so read at most 5 rows per partition
+        mocker.patch.object(
+            SparseTensorSchema,
+            "max_partition_weight",
+            new_callable=mocker.PropertyMock,
+            return_value=5,
+        )
+        spy = mocker.spy(WeightedRange, "partition_by_weight")
+        with ingest_in_tiledb(tmpdir, x_spec) as (x_params, x_data):
+            with ingest_in_tiledb(tmpdir, y_spec) as (y_params, y_data):
+                dataloader = PyTorchTileDBDataLoader(
+                    x_params,
+                    y_params,
+                    shuffle_buffer_size=shuffle_buffer_size,
+                    shuffle_strategy=shuffle_strategy,
+                    batch_size=8,
+                )
+                x_keys, y_keys = [], []
+                # since num_fields is 0, fields are all the array attributes of each
+                # array: the second item of the tensors of each array is "idx", the
+                # position of each value in the data array (row * 10 + column)
+                for (_, x_idx), (_, y_idx) in dataloader:
+                    x_keys.extend((x_idx[:, 0] // 10).tolist())
+                    # every sparse row has a single value, so its sum is that value
+                    y_keys.extend((y_idx.to_dense().sum(dim=1) // 10).tolist())
+
+        assert x_keys == y_keys
+        assert sorted(x_keys) == list(range(107))
+        assert spy.call_count > 0
+        assert all(call.args[1] == 5 for call in spy.call_args_list)
+
+    @pytest.mark.parametrize("shuffle_strategy", ["buffer", "partitions"])
+    def test_shuffle_seed(self, tmpdir, mocker, shuffle_strategy):
+        """Test that seeding torch makes the shuffled order reproducible."""
+        spec = ArraySpec(
+            sparse=True,
+            shape=(107, 10),
+            key_dim=0,
+            key_dim_dtype=np.dtype(np.int32),
+            non_key_dim_dtype=np.dtype(np.int32),
+            num_fields=0,
+            tensor_kind=None,
+        )
+        # each row has a single cell, so read the array in partitions of 10 rows
+        mocker.patch.object(
+            SparseTensorSchema,
+            "max_partition_weight",
+            new_callable=mocker.PropertyMock,
+            return_value=10,
+        )
+        with ingest_in_tiledb(tmpdir, spec) as (params, data):
+            dataloader = PyTorchTileDBDataLoader(
+                params,
+                shuffle_buffer_size=16,
+                shuffle_strategy=shuffle_strategy,
+                batch_size=8,
+            )
+
+            def load_keys(torch_seed, numpy_seed):
+                torch.manual_seed(torch_seed)
+                np.random.seed(numpy_seed)
+                # the second item of each batch corresponds to the "idx" attribute
+                # and every row has a single value, so its sum is that value
+                return [
+                    key
+                    for _, idx in dataloader
+                    for key in (idx.to_dense().sum(dim=1) // 10).tolist()
+                ]
+
+            keys = load_keys(0, 0)
+            assert sorted(keys) == list(range(107))
+            assert keys == load_keys(0, 1)
+            assert keys != load_keys(1, 0)
+
+    def test_invalid_shuffle_strategy(self, tmpdir):
+        spec = next(ArraySpec.combinations(sparse=[False]))
+        with ingest_in_tiledb(tmpdir, spec) as (params, data):
+            with pytest.raises(ValueError) as ex:
+                PyTorchTileDBDataLoader(params, shuffle_strategy="multi_range")
+            assert "Invalid shuffle_strategy" in str(ex.value)
+
+
+@pytest.mark.parametrize("buffer_size", [1, 7, 100, 200])
+def test_iter_shuffled(buffer_size):
+    items = list(range(100))
+    torch.manual_seed(0)
+    shuffled = list(_iter_shuffled(iter(items), buffer_size))
+    assert sorted(shuffled) == items
+    if buffer_size > 1:
+        assert shuffled != items
+    # the items are shuffled by the torch random number generator, not Numpy's
+    torch.manual_seed(0)
+    np.random.seed(1)
+    assert list(_iter_shuffled(iter(items), buffer_size)) == shuffled
+    torch.manual_seed(1)
+    if buffer_size > 1:
+        assert list(_iter_shuffled(iter(items), buffer_size)) != shuffled
@@ -24,6 +24,71 @@ class TestNumpyArrayCollator:
         assert get_tensor_kind(tensor) is pc.TensorKind.DENSE
         np.testing.assert_array_equal(tensor, np.stack(batch))
 
+    def test_collate_dense_rows(self):
+        values = np.random.rand(20, 2, 5)
+        collator = pc.NumpyArrayCollator()
+        # consecutive rows of the same array are collated without copying
+        for rows in list(values[3:10]), [values[4]]:
+            tensor = collator.collate(rows)
+            assert np.shares_memory(tensor.numpy(), values)
+            np.testing.assert_array_equal(tensor, np.stack(rows))
+        # any other rows are copied
+        for rows in (
+            list(values[10:3:-1]),
+            list(values[::3]),
+            [values[3], values[5], values[4]],
+            list(np.moveaxis(values, 1, 0)[:, 3:10]),
+        ):
+            tensor = collator.collate(rows)
+            assert not np.shares_memory(tensor.numpy(), values)
+            np.testing.assert_array_equal(tensor, np.stack(rows))
+
+    @pytest.mark.skipif(not torch.cuda.is_available(), reason="CUDA not available")
+    def test_collate_dense_pin_memory(self):
+        batch = [np.random.rand(2, 5) for _ in range(7)]
+        tensor = pc.NumpyArrayCollator(pin_memory=True).collate(batch)
+        assert tensor.shape == (7, 2, 5)
+        assert tensor.is_pinned()
+        assert get_tensor_kind(tensor) is pc.TensorKind.DENSE
+        np.testing.assert_array_equal(tensor, np.stack(batch))
+
+    @pytest.mark.parametrize("float_dtype", [torch.float16, torch.bfloat16])
+    def test_float_dtype(self, float_dtype):
+        collator = pc.NumpyArrayCollator(float_dtype=float_dtype)
+        value = np.random.rand(2, 5)
+        tensor = collator.convert(value)
+        assert tensor.dtype is float_dtype
+        np.testing.assert_allclose(tensor.float(), value, rtol=1e-2)
+
+        batch = [np.random.rand(2, 5) for _ in range(7)]
+        tensor = collator.collate(batch)
+        assert tensor.shape == (7, 2, 5)
+        assert tensor.dtype is float_dtype
+        np.testing.assert_allclose(tensor.float(), np.stack(batch), rtol=1e-2)
+
+        # non floating point arrays are not cast
+        batch = [np.random.randint(100, size=(2, 5)) for _ in range(7)]
+        tensor = collator.collate(batch)
+        assert tensor.dtype is torch.from_numpy(batch[0]).dtype
+        np.testing.assert_array_equal(tensor, np.stack(batch))
+
+    @pytest.mark.parametrize("float_dtype", [None, torch.float16])
+    def test_scalars(self, float_dtype):
+        # the rows of 1D arrays are Numpy scalars
+        values = np.random.rand(7).astype(np.float32)
+        dtype = float_dtype or torch.float32
+        collator = pc.NumpyArrayCollator(float_dtype=float_dtype)
+
+        tensor = collator.convert(values[0])
+        assert tensor.shape == ()
+        assert tensor.dtype is dtype
+        np.testing.assert_allclose(tensor.float(), values[0], rtol=1e-2)
+
+        tensor = collator.collate(list(values))
+        assert tensor.shape == (7,)
+        assert tensor.dtype is dtype
+        np.testing.assert_allclose(tensor.float(), values, rtol=1e-2)
+
     def test_convert_nested(self):
         value = np.random.rand(10)
         tensor = pc.NumpyArrayCollator(to_nested=True).convert(value)
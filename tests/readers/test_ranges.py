@@ -82,6 +82,13 @@ class TestIntRange:
                 list(self.r.partition_by_count(k))
             assert "Cannot partition range" in str(excinfo.value)
 
+    @pytest.mark.parametrize(
+        "bounds,expected_bounds",
+        [((12, 15), (12, 15)), ((0, 15), (10, 15)), ((12, 30), (12, 19))],
+    )
+    def test_subrange(self, bounds, expected_bounds):
+        assert self.r.subrange(*bounds) == IntRange(*expected_bounds)
+
     @pytest.mark.parametrize(
         "max_weight,expected_bounds",
         [
@@ -137,6 +144,12 @@ class TestConstrainedPartitionsIntRange:
             list(self.r.partition_by_count(k))
         assert "Cannot partition range" in str(excinfo.value)
 
+    def test_subrange(self):
+        subrange = self.r.subrange(12, 25)
+        assert isinstance(subrange, ConstrainedPartitionsIntRange)
+        assert (subrange.min, subrange.max) == (12, 25)
+        assert subrange.start_offsets == self.r.start_offsets
+
     @pytest.mark.parametrize(
         "max_weight,expected_bounds",
         [
@@ -249,6 +262,19 @@ class TestWeightedRange:
                 list(r.partition_by_count(k))
             assert "Cannot partition range" in str(excinfo.value)
 
+    @pytest.mark.parametrize(
+        "bounds,expected_mapping",
+        [
+            (("b", "d"), {"b": 1, "c": 2, "d": 3}),
+            (("bb", "dd"), {"c": 2, "d": 3}),
+            (("", "b"), {"a": 3, "b": 1}),
+            (("e", "z"), {"e": 1, "f": 4}),
+        ],
+    )
+    def test_subrange(self, bounds, expected_mapping):
+        subrange = self.r.subrange(*bounds)
+        assert subrange == WeightedRange.from_mapping(expected_mapping)
+
     parametrize_by_max_weight = pytest.mark.parametrize(
         "max_weight,expected_mappings",
         [
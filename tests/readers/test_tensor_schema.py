@@ -1,10 +1,14 @@
 import itertools as it
+import pickle
 import string
 
 import numpy as np
 import pytest
+import sparse
 
 import tiledb
+from tiledb.ml.readers._tensor_schema.query import ParallelAttrsKeyDimQuery
+from tiledb.ml.readers._tensor_schema.sparse_to_dense import to_dense
 from tiledb.ml.readers.types import ArrayParams
 
 
@@ -174,3 +178,51 @@ def _test_max_partition_weight(array, fields, key_dim, dim_selectors):
                 with pytest.raises(tiledb.TileDBError) as ex:
                     schema.query[key_range.min : key_ranges[i + 1].min]
                 assert "py.max_incomplete_retries" in str(ex.value)
+
+
+@pytest.mark.parametrize("read_ahead", [1, 3])
+def test_iter_results_read_ahead(dense_uri, read_ahead):
+    with tiledb.open(dense_uri) as array:
+        schema = ArrayParams(array).tensor_schema
+        key_ranges = list(schema.key_range.partition_by_weight(1000))
+        expected = list(schema.query.iter_results(key_ranges))
+        results = list(schema.query.iter_results(key_ranges, read_ahead))
+        assert [key_range for key_range, _ in results] == key_ranges
+        for (_, expected_arrays), (_, field_arrays) in zip(expected, results):
+            assert field_arrays.keys() == expected_arrays.keys()
+            for field, array in field_arrays.items():
+                np.testing.assert_array_equal(array, expected_arrays[field])
+
+
+def test_query_cached(dense_uri):
+    with tiledb.open(dense_uri) as array:
+        schema = ArrayParams(array).tensor_schema
+        assert schema.query is schema.query
+        # the cached query is not pickled but it is recreated on demand
+        unpickled = pickle.loads(pickle.dumps(schema))
+        assert "_query" not in vars(unpickled)
+        assert unpickled.query is unpickled.query
+
+
+def test_parallel_attrs_query(dense_uri):
+    with tiledb.open(dense_uri) as array:
+        fields = ["d1", "af8", "af4", "au1"]
+        schema = ArrayParams(array, fields=fields).tensor_schema
+        assert isinstance(schema.query, ParallelAttrsKeyDimQuery)
+        field_arrays = schema.query[100:299]
+        expected = array.query(attrs=fields[1:], dims=fields[:1]).multi_index[100:299]
+        assert field_arrays.keys() == expected.keys()
+        for field, values in field_arrays.items():
+            np.testing.assert_array_equal(values, expected[field])
+
+
+@pytest.mark.parametrize("has_duplicates", [False, True])
+def test_to_dense(has_duplicates):
+    shape = (10, 4, 6)
+    coords = np.stack([np.random.randint(n, size=50) for n in shape])
+    if not has_duplicates:
+        coords = np.unique(coords, axis=1)
+    data = np.random.rand(coords.shape[1])
+    dense = to_dense(tuple(coords), data, shape, has_duplicates)
+    expected = sparse.COO(coords, data, shape, has_duplicates=has_duplicates).todense()
+    np.testing.assert_array_equal(dense, expected)
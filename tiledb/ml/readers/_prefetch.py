@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Any, Iterable, Iterator, TypeVar, cast
+
+T = TypeVar("T")
+
+
+class PrefetchIterator(Iterator[T]):
+    """
+    Iterator that consumes an iterable in a background thread.
+
+    Up to `buffer_size` items are produced ahead of the consumer and kept in a bounded
+    queue. This way producing the next item (e.g. reading a TileDB slice, which releases
+    the GIL) overlaps with the processing of the current one by the consumer.
+    """
+
+    def __init__(self, iterable: Iterable[T], buffer_size: int):
+        self._closed = threading.Event()
+        self._exhausted = False
+        if buffer_size < 1:
+            raise ValueError(f"Buffer size must be positive: {buffer_size}")
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=buffer_size)
+        self._thread = threading.Thread(
+            target=_produce, args=(iterable, self._queue, self._closed), daemon=True
+        )
+        self._thread.start()
+
+    def __next__(self) -> T:
+        if self._exhausted:
+            raise StopIteration
+        item = self._queue.get()
+        if item is _END:
+            self._exhausted = True
+            raise StopIteration
+        if isinstance(item, _Error):
+            self._exhausted = True
+            raise item.exception
+        return cast(T, item)
+
+    def close(self) -> None:
+        """Stop the background thread; any remaining items are discarded."""
+        self._exhausted = True
+        self._closed.set()
+
+    def __del__(self) -> None:
+        self.close()
+
+
+def _produce(
+    iterable: Iterable[Any], buffer: queue.Queue[Any], closed: threading.Event
+) -> None:
+    # the producer should not hold a reference to the PrefetchIterator, otherwise the
+    # latter would never be garbage collected (and closed) while the thread is running
+    def put(item: Any) -> bool:
+        # don't block forever if the consumer goes away while the buffer is full
+        while not closed.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    try:
+        for item in iterable:
+            if not put(item):
+                return
+    except Exception as ex:
+        put(_Error(ex))
+    else:
+        put(_END)
+
+
+class _Error:
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+_END = object()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, Sequence, TypeVar
+from typing import Any, Generic, Optional, Sequence, TypeVar
 
 import numpy as np
 import scipy.sparse
@@ -36,18 +36,34 @@ class Collator(ABC, Generic[T]):
         """
 
     @classmethod
-    def from_schemas(cls, *schemas: TensorSchema[Any]) -> Collator[Any]:
+    def from_schemas(
+        cls,
+        *schemas: TensorSchema[Any],
+        pin_memory: bool = False,
+        float_dtype: Optional[torch.dtype] = None,
+    ) -> Collator[Any]:
         """
         Return an appropriate Collator for collating instances generated by the
         `iter_tensors()` method of the given schema(s).
+
+        :param pin_memory: If true, dense batches are collated into pinned memory.
+        :param float_dtype: If not None, dense floating point tensors are cast to this
+            dtype.
         """
         if len(schemas) > 1:
-            return RowCollator(tuple(map(cls.from_schemas, schemas)))
+            return RowCollator(
+                tuple(
+                    cls.from_schemas(s, pin_memory=pin_memory, float_dtype=float_dtype)
+                    for s in schemas
+                )
+            )
 
         schema = schemas[0]
         collator: Collator[Any]
         if schema.kind is TensorKind.DENSE:
-            collator = NumpyArrayCollator()
+            collator = NumpyArrayCollator(
+                pin_memory=pin_memory, float_dtype=float_dtype
+            )
         elif schema.kind is TensorKind.RAGGED:
             collator = NumpyArrayCollator(to_nested=True)
         else:
@@ -84,6 +100,8 @@ class RowCollator(Collator[Sequence[Any]]):
         )
 
     def collate(self, batch: Sequence[Sequence[Any]]) -> Sequence[torch.Tensor]:
+        # transposing the rows to columns copies only references, not data: every value
+        # is copied once, by the column collator (e.g. np.stack for dense arrays)
         columns = tuple(zip(*batch))
         assert len(columns) == len(self.column_collators)
         return tuple(
@@ -98,18 +116,93 @@ class NumpyArrayCollator(Collator[np.ndarray]):
 
     to_nested: If true, collate 1D Numpy arrays with possibly different length to nested
         `torch.Tensor`s. Otherwise, all the arrays to be collated must have the same shape
+    pin_memory: If true (and `to_nested` is false), collate the arrays directly into a
+        newly allocated page-locked (pinned) tensor instead of pinning a stacked copy
+    float_dtype: If not None (and `to_nested` is false), cast floating point arrays to
+        this dtype (e.g. `torch.float16`) while collating them, so that the tensors
+        moved to the device are smaller. Non floating point arrays are not cast
     """
 
     to_nested: bool = False
+    pin_memory: bool = False
+    float_dtype: Optional[torch.dtype] = None
 
     def convert(self, value: np.ndarray) -> torch.Tensor:
-        return torch.from_numpy(value)
+        # unbatched rows of 1D arrays are Numpy scalars, which torch.from_numpy rejects
+        tensor = torch.as_tensor(value)
+        cast_dtype = None if self.to_nested else self._cast_dtype(value.dtype)
+        return tensor.to(cast_dtype) if cast_dtype is not None else tensor
 
     def collate(self, batch: Sequence[np.ndarray]) -> torch.Tensor:
         if self.to_nested:
             return nested_tensor(list(map(torch.from_numpy, batch)))
+        # rows of 1D arrays are Numpy scalars: get their dtype and shape without
+        # converting them to tensors
+        row_dtype, row_shape = np.result_type(batch[0]), np.shape(batch[0])
+        cast_dtype = self._cast_dtype(row_dtype)
+        if not self.pin_memory and cast_dtype is None:
+            stacked = _stacked_view(batch)
+            return torch.from_numpy(stacked if stacked is not None else np.stack(batch))
+        # allocate a new tensor for every batch: previous batches may still be in use,
+        # so their memory cannot be reused
+        dtype = cast_dtype if cast_dtype is not None else _torch_dtype(row_dtype)
+        tensor = torch.empty(
+            (len(batch), *row_shape), dtype=dtype, pin_memory=self.pin_memory
+        )
+        if dtype is torch.bfloat16:
+            # bfloat16 has no Numpy equivalent, so stack and cast in two steps
+            tensor.copy_(torch.from_numpy(np.stack(batch)))
         else:
-            return torch.from_numpy(np.stack(batch))
+            # stack and cast in a single pass
+            np.stack(batch, out=tensor.numpy())
+        return tensor
+
+    def _cast_dtype(self, dtype: np.dtype) -> Optional[torch.dtype]:
+        """Return the dtype to cast arrays of `dtype` to, or None if they are not cast"""
+        if self.float_dtype is not None and np.issubdtype(dtype, np.floating):
+            return self.float_dtype
+        return None
+
+
+def _torch_dtype(dtype: np.dtype) -> torch.dtype:
+    """Return the torch dtype that corresponds to the given Numpy dtype."""
+    return torch.from_numpy(np.empty(0, dtype=dtype)).dtype
+
+
+def _stacked_view(batch: Sequence[np.ndarray]) -> Optional[np.ndarray]:
+    """
+    Return a view equal to `np.stack(batch)` if it can be created without copying.
+
+    This is the case if the arrays are adjacent C-contiguous views of the same base
+    array, e.g. consecutive rows of a batch generated by `TensorSchema.iter_tensors`.
+    Otherwise return None.
+    """
+    first = batch[0]
+    if not first.flags.c_contiguous:
+        return None
+    if len(batch) == 1:
+        return first[np.newaxis]
+    base = first.base
+    if base is None:
+        return None
+    start, step = _address(first), first.nbytes
+    shape, strides, dtype = first.shape, first.strides, first.dtype
+    for i, array in enumerate(batch):
+        if not (
+            array.base is base
+            and _address(array) == start + i * step
+            and array.shape == shape
+            and array.strides == strides
+            and array.dtype == dtype
+        ):
+            return None
+    return np.lib.stride_tricks.as_strided(
+        first, shape=(len(batch), *shape), strides=(step, *strides)
+    )
+
+
+def _address(array: np.ndarray) -> int:
+    return int(array.__array_interface__["data"][0])
 
 
 @dataclass(frozen=True)
@@ -130,7 +223,19 @@ class SparseCOOCollator(Collator[sparse.COO]):
             return torch.sparse_coo_tensor(value.coords, value.data, value.shape)
 
     def collate(self, batch: Sequence[sparse.COO]) -> torch.Tensor:
-        return self.convert(sparse.stack(batch))
+        # concatenate the coordinates and data directly instead of using sparse.stack()
+        nnzs = [value.nnz for value in batch]
+        coords = np.concatenate([value.coords for value in batch], axis=1)
+        data = np.concatenate([value.data for value in batch])
+        shape = (len(batch), *batch[0].shape)
+        if self.to_csr:
+            # sparse.COO coordinates are sorted, so the coordinates of 1D values are the
+            # column indices of the respective CSR row
+            crow_indices = np.concatenate(([0], np.cumsum(nnzs)))
+            return torch.sparse_csr_tensor(crow_indices, coords[0], data, shape)
+        batch_indices = np.repeat(np.arange(len(batch)), nnzs)
+        indices = torch.from_numpy(np.vstack((batch_indices, coords)))
+        return torch.sparse_coo_tensor(indices, data, shape)
 
 
 @dataclass(frozen=True)
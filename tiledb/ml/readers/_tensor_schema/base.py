@@ -78,7 +78,12 @@ class TensorSchema(ABC, Generic[Tensor]):
     @property
     def query(self) -> KeyDimQuery:
         """A sliceable object for querying the TileDB array along the key dimension"""
-        return self._get_query(**self._query_kwargs)
+        self._query: KeyDimQuery
+        try:
+            return self._query
+        except AttributeError:
+            self._query = self._get_query(**self._query_kwargs)
+            return self._query
 
     @property
     def key_dim(self) -> str:
@@ -111,7 +116,7 @@ class TensorSchema(ABC, Generic[Tensor]):
 
     @abstractmethod
     def iter_tensors(
-        self, key_ranges: Iterable[InclusiveRange[Any, int]]
+        self, key_ranges: Iterable[InclusiveRange[Any, int]], read_ahead: int = 0
     ) -> Union[Iterable[Tensor], Iterable[Sequence[Tensor]]]:
         """
         Generate batches of tensors.
@@ -121,9 +126,21 @@ class TensorSchema(ABC, Generic[Tensor]):
         - a single tensor if N == 1.
         where each tensor has shape `(len(key_range), *self.shape[1:])`.
 
+        The memory of the yielded tensors is owned by the caller: it is never reused for
+        subsequent batches, so tensors (or views of them) can be retained without being
+        copied, e.g. in a shuffle buffer.
+
         :param key_ranges: Inclusive ranges along the key dimension.
+        :param read_ahead: Maximum number of key ranges read concurrently ahead of the
+            one currently being converted to tensors.
         """
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # the cached query is bound to this process and it is recreated on demand
+        state = dict(self.__dict__)
+        state.pop("_query", None)
+        return state
+
     def _get_query(self, **kwargs: Any) -> KeyDimQuery:
         return KeyDimQuery(
             self._array, self._key_dim_index, self._dim_selectors, **kwargs
@@ -1,10 +1,11 @@
 from math import ceil
-from typing import Any, Counter
+from operator import itemgetter
+from typing import Any, Counter, Iterable, Iterator, List, Sequence, Tuple, cast
 
 import numpy as np
 
 from .base import Tensor, TensorSchema
-from .ranges import WeightedRange
+from .ranges import InclusiveRange, WeightedRange
 
 
 class BaseSparseTensorSchema(TensorSchema[Tensor]):
@@ -60,3 +61,42 @@ class BaseSparseTensorSchema(TensorSchema[Tensor]):
         # Finally, the number of cells that can fit in the memory_budget depends on the
         # maximum bytes_per_cell
         return max(1, memory_budget // ceil(max(bytes_per_cell)))
+
+    def _iter_coords_data(
+        self, key_ranges: Iterable[InclusiveRange[Any, int]], read_ahead: int = 0
+    ) -> Iterator[Tuple[Sequence[int], List[np.ndarray], Any]]:
+        """
+        Generate a `(shape, coords, data)` tuple for each of the given key ranges.
+
+        - `shape` is the shape of the tensor(s) for the key range.
+        - `coords` is a list of zero-based coordinates arrays, one per dimension (with the
+          key dimension first).
+        - `data` is the array of the single field or a tuple of arrays, one per field.
+
+        All the dimensions of the array must be included in the query.
+        """
+        shape = list(cast(Sequence[int], self.shape))
+        get_data = itemgetter(*self._fields)
+        key_dim, *non_key_dims = self._all_dims
+        non_key_dim_starts = tuple(map(itemgetter(0), self._ned[1:]))
+        fields = frozenset(self._fields)
+        for key_range, field_arrays in self.query.iter_results(key_ranges, read_ahead):
+            # Set the shape of the key dimension equal to the current key range length
+            shape[0] = len(key_range)
+            data = get_data(field_arrays)
+
+            # Convert coordinates from the original domain to zero-based
+            # For the key (i.e. first) dimension get the indices of the keys
+            coords = [key_range.indices(field_arrays.pop(key_dim))]
+            # For every non-key dimension, subtract the minimum value of the dimension
+            # TODO: update this for non-integer non-key dimensions
+            for dim, dim_start in zip(non_key_dims, non_key_dim_starts):
+                dim_coords = field_arrays.pop(dim)
+                if dim_start:
+                    if dim in fields:
+                        # the dimension values are also data, don't modify them
+                        dim_coords = dim_coords - dim_start
+                    else:
+                        dim_coords -= dim_start
+                coords.append(dim_coords)
+            yield tuple(shape), coords, data
@@ -5,6 +5,7 @@ from typing import Any, Iterable, Sequence, Union
 import numpy as np
 
 from .base import TensorSchema
+from .query import KeyDimQuery, ParallelAttrsKeyDimQuery
 from .ranges import ConstrainedPartitionsIntRange, InclusiveRange
 
 
@@ -43,7 +44,7 @@ class DenseTensorSchema(TensorSchema[np.ndarray]):
             return self._key_range
 
     def iter_tensors(
-        self, key_ranges: Iterable[InclusiveRange[int, int]]
+        self, key_ranges: Iterable[InclusiveRange[int, int]], read_ahead: int = 0
     ) -> Union[Iterable[np.ndarray], Iterable[Sequence[np.ndarray]]]:
         """
         Generate batches of Numpy arrays.
@@ -53,16 +54,31 @@ class DenseTensorSchema(TensorSchema[np.ndarray]):
         `key_dim_index == 1`, then `a[:, 4:8, :]` returns arrays of shape (5, 4, 20) but
         this method yields arrays of shape (4, 5, 20).
         """
-        query = self.query
+        results = self.query.iter_results(key_ranges, read_ahead)
         get_data = itemgetter(*self._fields)
         key_dim_index = self._key_dim_index
-        for key_range in key_ranges:
-            field_arrays = query[key_range.min : key_range.max]
-            if key_dim_index > 0:
-                # Move key_dim_index axes first
-                for field, array in field_arrays.items():
-                    field_arrays[field] = np.moveaxis(array, key_dim_index, 0)
-            yield get_data(field_arrays)
+        # select the loop once instead of branching for every batch
+        if key_dim_index == 0:
+            for _, field_arrays in results:
+                yield get_data(field_arrays)
+        elif self.num_fields == 1:
+            field = self._fields[0]
+            # Move key_dim_index axes first
+            for _, field_arrays in results:
+                yield np.moveaxis(field_arrays[field], key_dim_index, 0)
+        else:
+            # Move key_dim_index axes first
+            for _, field_arrays in results:
+                data = get_data(field_arrays)
+                yield tuple(np.moveaxis(d, key_dim_index, 0) for d in data)
+
+    def _get_query(self, **kwargs: Any) -> KeyDimQuery:
+        if len(kwargs.get("attrs", ())) > 1:
+            # read the attributes in parallel, one query per attribute
+            return ParallelAttrsKeyDimQuery(
+                self._array, self._key_dim_index, self._dim_selectors, **kwargs
+            )
+        return super()._get_query(**kwargs)
 
     @property
     def max_partition_weight(self) -> int:
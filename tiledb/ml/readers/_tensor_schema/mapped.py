@@ -23,9 +23,9 @@ class MappedTensorSchema(wrapt.ObjectProxy, Generic[Tensor, MappedTensor]):
         self._self_map_tensor = map_tensor
 
     def iter_tensors(
-        self, key_ranges: Iterable[InclusiveRange[Any, int]]
+        self, key_ranges: Iterable[InclusiveRange[Any, int]], read_ahead: int = 0
     ) -> Union[Iterable[MappedTensor], Iterable[Sequence[MappedTensor]]]:
-        wrapped_iter_tensors = self.__wrapped__.iter_tensors(key_ranges)
+        wrapped_iter_tensors = self.__wrapped__.iter_tensors(key_ranges, read_ahead)
         if self.num_fields == 1:
             return map(self._self_map_tensor, wrapped_iter_tensors)
         else:
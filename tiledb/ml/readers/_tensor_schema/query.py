@@ -1,8 +1,11 @@
-from typing import Any, List, Mapping
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
 
 import tiledb
 
 from ..types import Selector
+from .ranges import InclusiveRange
 
 
 class KeyDimQuery:
@@ -13,7 +16,7 @@ class KeyDimQuery:
         dim_selectors: Mapping[int, Selector],
         **kwargs: Any,
     ):
-        self._multi_index = array.query(**kwargs).multi_index
+        self._query = array.query(**kwargs)
         selectors: List[Selector] = [slice(None)] * array.ndim
         for i, selector in dim_selectors.items():
             if i == 0:
@@ -29,5 +32,92 @@ class KeyDimQuery:
 
     def __getitem__(self, key_dim_slice: slice) -> Any:
         """Query the TileDB array by `dim_key=key_dim_slice`."""
-        selectors = (*self._leading_selectors, key_dim_slice, *self._trailing_selectors)
-        return self._multi_index[selectors]
+        # a new multi-range indexer for every call since indexers are not thread-safe
+        return self._query.multi_index[self._get_selectors(key_dim_slice)]
+
+    def iter_results(
+        self, key_ranges: Iterable[InclusiveRange[Any, int]], read_ahead: int = 0
+    ) -> Iterator[Tuple[InclusiveRange[Any, int], Any]]:
+        """
+        Query the TileDB array for each of the given key ranges.
+
+        Generate `(key_range, result)` tuples in the order of `key_ranges`.
+
+        :param key_ranges: Inclusive ranges along the key dimension.
+        :param read_ahead: If greater than zero, up to `read_ahead` queries for the
+            next key ranges are submitted to a thread pool while the current result is
+            being consumed, so that the storage backend can serve them concurrently.
+            The thread pool runs only the TileDB queries, which release the GIL; any
+            post-processing of the results is left to the consumer.
+        """
+        if read_ahead <= 0:
+            for key_range in key_ranges:
+                yield key_range, self[key_range.min : key_range.max]
+            return
+
+        pending: Deque[Tuple[InclusiveRange[Any, int], Future[Any]]] = deque()
+        with ThreadPoolExecutor(max_workers=read_ahead) as executor:
+            try:
+                for key_range in key_ranges:
+                    key_dim_slice = slice(key_range.min, key_range.max)
+                    future = executor.submit(self.__getitem__, key_dim_slice)
+                    pending.append((key_range, future))
+                    if len(pending) > read_ahead:
+                        key_range, future = pending.popleft()
+                        yield key_range, future.result()
+                while pending:
+                    key_range, future = pending.popleft()
+                    yield key_range, future.result()
+            finally:
+                # don't wait for the reads that have not started if the consumer stops
+                for _, future in pending:
+                    future.cancel()
+
+    def _get_selectors(self, key_dim_slice: slice) -> Tuple[Selector, ...]:
+        return (*self._leading_selectors, key_dim_slice, *self._trailing_selectors)
+
+
+class ParallelAttrsKeyDimQuery(KeyDimQuery):
+    """
+    KeyDimQuery that reads each attribute with a separate TileDB query. The queries of
+    each slice are issued in parallel by a thread pool and their results are merged.
+
+    This is valid only for dense arrays: sparse arrays do not guarantee that separate
+    queries return the cells in the same order.
+    """
+
+    def __init__(
+        self,
+        array: tiledb.Array,
+        key_dim_index: int,
+        dim_selectors: Mapping[int, Selector],
+        attrs: Sequence[str],
+        dims: Sequence[str] = (),
+        **kwargs: Any,
+    ):
+        first_attr, *other_attrs = attrs
+        # the first query also reads the requested dimensions (if any)
+        super().__init__(
+            array,
+            key_dim_index,
+            dim_selectors,
+            attrs=(first_attr,),
+            dims=dims,
+            **kwargs,
+        )
+        self._queries = [self._query]
+        self._queries.extend(
+            array.query(attrs=(attr,), dims=(), **kwargs) for attr in other_attrs
+        )
+        self._executor = ThreadPoolExecutor(max_workers=len(self._queries))
+
+    def __getitem__(self, key_dim_slice: slice) -> Any:
+        selectors = self._get_selectors(key_dim_slice)
+        futures = [
+            self._executor.submit(lambda q: q.multi_index[selectors], query)
+            for query in self._queries
+        ]
+        field_arrays: Dict[str, Any] = {}
+        for future in futures:
+            field_arrays.update(future.result())
+        return field_arrays
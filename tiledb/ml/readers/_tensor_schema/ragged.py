@@ -38,13 +38,11 @@ class RaggedTensorSchema(BaseSparseTensorSchema[RaggedArray]):
         return len(self.key_range), None
 
     def iter_tensors(
-        self, key_ranges: Iterable[InclusiveRange[int, int]]
+        self, key_ranges: Iterable[InclusiveRange[int, int]], read_ahead: int = 0
     ) -> Union[Iterable[RaggedArray], Iterable[Sequence[RaggedArray]]]:
-        query = self.query
         get_data = itemgetter(*self._fields)
         key_dim = self.key_dim
-        for key_range in key_ranges:
-            field_arrays = query[key_range.min : key_range.max]
+        for _, field_arrays in self.query.iter_results(key_ranges, read_ahead):
             # Sort the key dimension values and find the indices where the value changes
             sort_idx = np.argsort(field_arrays[key_dim], kind="stable")
             split_idx = argdiff(field_arrays[key_dim][sort_idx])
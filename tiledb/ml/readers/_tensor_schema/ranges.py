@@ -3,7 +3,7 @@ from __future__ import annotations
 import itertools as it
 from abc import ABC, abstractmethod
 from bisect import bisect
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Any, Generic, Iterable, Mapping, TypeVar, cast
 
 import numpy as np
@@ -82,6 +82,10 @@ class InclusiveRange(ABC, Generic[V, W]):
             and np.all(self.values == other.values)
         )
 
+    @abstractmethod
+    def subrange(self, min_value: V, max_value: V) -> InclusiveRange[V, W]:
+        """Get the subrange of the members `m` with `min_value <= m <= max_value`."""
+
     @abstractmethod
     def partition_by_count(self, k: int) -> Iterable[InclusiveRange[V, W]]:
         """Partition this range into `k` subranges of approximately equal weight."""
@@ -149,6 +153,10 @@ class IntRange(InclusiveRange[int, int]):
             return super().equal_values(other)
         return self.min == other.min and self.max == other.max
 
+    def subrange(self, min_value: int, max_value: int) -> IntRange:
+        # replace() preserves any additional fields of subclasses
+        return replace(self, min=max(self.min, min_value), max=min(self.max, max_value))
+
     def partition_by_count(self, k: int) -> Iterable[IntRange]:
         n = len(self)
         if not (1 <= k <= n):
@@ -292,6 +300,13 @@ class WeightedRange(InclusiveRange[VDtype, WDtype]):
             raise ValueError(f"Values not in the range {self}")
         return indices
 
+    def subrange(
+        self, min_value: VDtype, max_value: VDtype
+    ) -> WeightedRange[VDtype, WDtype]:
+        start = int(np.searchsorted(self.values, min_value, side="left"))
+        stop = int(np.searchsorted(self.values, max_value, side="right"))
+        return WeightedRange(self.values[start:stop], self.weights[start:stop])
+
     def partition_by_count(self, k: int) -> Iterable[WeightedRange[VDtype, WDtype]]:
         n = len(self)
         if not (1 <= k <= n):
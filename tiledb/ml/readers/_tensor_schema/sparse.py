@@ -1,5 +1,4 @@
-from operator import itemgetter
-from typing import Any, Iterable, Sequence, Union, cast
+from typing import Any, Iterable, Iterator, Sequence, Union
 
 import numpy as np
 import scipy.sparse
@@ -9,6 +8,8 @@ from .base_sparse import BaseSparseTensorSchema
 from .ranges import InclusiveRange
 
 SparseArray = Union[scipy.sparse.csr_matrix, sparse.COO]
+# one coordinates array per dimension, either stacked in a 2D array or not
+Coords = Union[np.ndarray, Sequence[np.ndarray]]
 
 
 class SparseTensorSchema(BaseSparseTensorSchema[SparseArray]):
@@ -21,40 +22,74 @@ class SparseTensorSchema(BaseSparseTensorSchema[SparseArray]):
         self._query_kwargs["dims"] = self._all_dims
 
     def iter_tensors(
-        self, key_ranges: Iterable[InclusiveRange[Any, int]]
+        self, key_ranges: Iterable[InclusiveRange[Any, int]], read_ahead: int = 0
     ) -> Union[Iterable[SparseArray], Iterable[Sequence[SparseArray]]]:
-        shape = list(cast(Sequence[int], self.shape))
-        SparseArrayFactory = csr_matrix if len(shape) == 2 else sparse.COO
-        query = self.query
-        get_data = itemgetter(*self._fields)
+        is_csr = len(self.shape) == 2
+        if is_csr:
+            SparseArrayFactory, SparseArraysFactory = csr_matrix, csr_matrices
+        else:
+            SparseArrayFactory, SparseArraysFactory = coo_array, coo_arrays
         single_field = len(self._fields) == 1
-        key_dim, *non_key_dims = self._all_dims
-        non_key_dim_starts = tuple(map(itemgetter(0), self._ned[1:]))
-        for key_range in key_ranges:
-            # Set the shape of the key dimension equal to the current key range length
-            shape[0] = len(key_range)
-            field_arrays = query[key_range.min : key_range.max]
-            data = get_data(field_arrays)
-
-            # Convert coordinates from the original domain to zero-based
-            # For the key (i.e. first) dimension get the indices of the keys
-            coords = [key_range.indices(field_arrays.pop(key_dim))]
-            # For every non-key dimension, subtract the minimum value of the dimension
-            # TODO: update this for non-integer non-key dimensions
-            coords.extend(
-                field_arrays.pop(dim) - dim_start
-                for dim, dim_start in zip(non_key_dims, non_key_dim_starts)
-            )
-            coords = np.array(coords)
-
+        has_duplicates = self._array.schema.allows_duplicates
+        for shape, coords, data in self._iter_coords_data(key_ranges, read_ahead):
+            # sparse.COO needs an (ndim, nnz) coordinates array: stack the coordinates
+            # once per batch, not once per field. csr_matrix takes the row and column
+            # indices as they are, without copying them into a new array
+            batch_coords: Coords = coords if is_csr else np.array(coords)
             # yield either a single SparseArray or one SparseArray per field
             if single_field:
-                yield SparseArrayFactory(coords, data, shape)
+                yield SparseArrayFactory(batch_coords, data, shape)
+            elif has_duplicates:
+                # duplicate coordinates must be summed separately for each field
+                yield tuple(SparseArrayFactory(batch_coords, d, shape) for d in data)
             else:
-                yield tuple(SparseArrayFactory(coords, d, shape) for d in data)
+                yield tuple(SparseArraysFactory(batch_coords, data, shape))
 
 
 def csr_matrix(
-    coords: np.ndarray, data: np.ndarray, shape: Sequence[int]
+    coords: Coords, data: np.ndarray, shape: Sequence[int]
 ) -> scipy.sparse.csr_matrix:
-    return scipy.sparse.csr_matrix((data, coords), shape)
+    rows, cols = coords
+    return scipy.sparse.csr_matrix((data, (rows, cols)), shape)
+
+
+def csr_matrices(
+    coords: Coords, data: Sequence[np.ndarray], shape: Sequence[int]
+) -> Iterator[scipy.sparse.csr_matrix]:
+    """
+    Generate one csr_matrix per data array, all of them with the same coordinates.
+
+    The coordinates (which must not contain duplicates) are converted to CSR indices
+    only once. The permutation applied by the conversion is tracked by converting a
+    range of positions as data and it is then applied to each data array.
+    """
+    template = csr_matrix(coords, np.arange(len(data[0])), shape)
+    order = template.data
+    for d in data:
+        yield scipy.sparse.csr_matrix(
+            (d[order], template.indices, template.indptr), shape
+        )
+
+
+def coo_array(coords: Coords, data: np.ndarray, shape: Sequence[int]) -> sparse.COO:
+    return sparse.COO(np.asarray(coords), data, shape)
+
+
+def coo_arrays(
+    coords: Coords, data: Sequence[np.ndarray], shape: Sequence[int]
+) -> Iterator[sparse.COO]:
+    """
+    Generate one sparse.COO per data array, all of them with the same coordinates.
+
+    The coordinates (which must not contain duplicates) are sorted only once. The
+    permutation applied by the sorting is tracked by sorting a range of positions as
+    data and it is then applied to each data array.
+    """
+    template = sparse.COO(
+        np.asarray(coords), np.arange(len(data[0])), shape, has_duplicates=False
+    )
+    order = template.data
+    for d in data:
+        yield sparse.COO(
+            template.coords, d[order], shape, has_duplicates=False, sorted=True
+        )
@@ -1,28 +1,48 @@
-from functools import singledispatch
-from operator import methodcaller
-from typing import Any
+from typing import Any, Iterable, Sequence, Tuple, Union
 
 import numpy as np
-import scipy.sparse
-import sparse
 
-from .base import TensorSchema
-from .mapped import MappedTensorSchema
-from .sparse import SparseTensorSchema
+from .base_sparse import BaseSparseTensorSchema
+from .ranges import InclusiveRange
 
 
-def SparseToDenseTensorSchema(**kwargs: Any) -> TensorSchema[np.ndarray]:
+class SparseToDenseTensorSchema(BaseSparseTensorSchema[np.ndarray]):
     """
-    Return a TensorSchema for reading sparse TileDB arrays as (dense) Numpy arrays.
-    """
-    return MappedTensorSchema(SparseTensorSchema(**kwargs), to_dense)
-
-
-@singledispatch
-def to_dense(sa: Any) -> np.ndarray:
-    """Create a Numpy array from a sparse array"""
-    raise NotImplementedError
+    TensorSchema for reading sparse TileDB arrays as (dense) Numpy arrays.
 
+    The arrays are filled directly from the coordinates and data of the query results,
+    without building intermediate sparse arrays. Values of duplicate coordinates are
+    summed, as when converting sparse arrays to dense.
+    """
 
-to_dense.register(sparse.COO)(methodcaller("todense"))  # type: ignore
-to_dense.register(scipy.sparse.csr_matrix)(methodcaller("toarray"))  # type: ignore
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._query_kwargs["dims"] = self._all_dims
+
+    def iter_tensors(
+        self, key_ranges: Iterable[InclusiveRange[Any, int]], read_ahead: int = 0
+    ) -> Union[Iterable[np.ndarray], Iterable[Sequence[np.ndarray]]]:
+        single_field = len(self._fields) == 1
+        has_duplicates = self._array.schema.allows_duplicates
+        for shape, coords, data in self._iter_coords_data(key_ranges, read_ahead):
+            index = tuple(coords)
+            if single_field:
+                yield to_dense(index, data, shape, has_duplicates)
+            else:
+                yield tuple(to_dense(index, d, shape, has_duplicates) for d in data)
+
+
+def to_dense(
+    index: Tuple[np.ndarray, ...],
+    data: np.ndarray,
+    shape: Sequence[int],
+    has_duplicates: bool,
+) -> np.ndarray:
+    """Create a Numpy array from the coordinates and data of its non-zero values"""
+    dense = np.zeros(shape, dtype=data.dtype)
+    if has_duplicates:
+        # unlike fancy index assignment, ufunc.at accumulates duplicate coordinates
+        np.add.at(dense, index, data)
+    else:
+        dense[index] = data
+    return dense
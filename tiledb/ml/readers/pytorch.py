@@ -1,20 +1,34 @@
 """Functionality for loading data from TileDB arrays to the PyTorch Dataloader API."""
 
 from functools import partial
-from typing import Any, Callable, Iterator, Sequence, Tuple, Union
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 import scipy.sparse
 import sparse
+import torch
 import torchdata
 from torch.utils.data import DataLoader, IterDataPipe
 from torchdata.datapipes.iter import IterableWrapper
 
+from ._prefetch import PrefetchIterator
 from ._pytorch_collators import Collator
 from ._tensor_schema import TensorSchema
 from ._tensor_schema.ranges import InclusiveRange
 from .types import ArrayParams, TensorKind
 
+T = TypeVar("T")
 TensorLike = Union[np.ndarray, sparse.COO, scipy.sparse.csr_matrix]
 TensorLikeOrTuple = Union[TensorLike, Tuple[TensorLike, ...]]
 
@@ -22,25 +36,44 @@ TensorLikeOrTuple = Union[TensorLike, Tuple[TensorLike, ...]]
 def PyTorchTileDBDataLoader(
     *all_array_params: ArrayParams,
     shuffle_buffer_size: int = 0,
+    shuffle_strategy: str = "buffer",
+    prefetch_buffer_size: int = 2,
+    read_ahead: int = 0,
+    float_dtype: Optional[torch.dtype] = None,
     **kwargs: Any,
 ) -> DataLoader:
     """Return a DataLoader for loading data from TileDB arrays.
 
     :param all_array_params: One or more `ArrayParams` instances, one per TileDB array.
     :param shuffle_buffer_size: Number of elements from which this dataset will sample.
+    :param shuffle_strategy: Either "buffer" (default), to shuffle the rows only by
+        sampling them from the shuffle buffer, or "partitions", to also read the
+        partitions of the key range in a different random order on every iteration.
+        The latter shuffles the rows across the whole array at no extra I/O cost.
+    :param prefetch_buffer_size: Number of batches read ahead from each TileDB array
+        in a background thread, overlapping I/O with computation. 0 disables prefetching.
+    :param read_ahead: Number of TileDB reads issued concurrently ahead of the current
+        one. Useful for storage backends that serve concurrent requests efficiently
+        (e.g. S3); it increases the memory footprint proportionally. 0 disables it.
+    :param float_dtype: If given (e.g. `torch.float16` or `torch.bfloat16`), dense
+        floating point tensors are cast to this dtype when they are collated. This
+        reduces the amount of memory copied to the device for mixed-precision training.
 
     Keyword Args:  Contains all parameters for PyTorch Dataloader.
         - batch_size: How many samples per batch to load (default: ``1``).
         - prefetch_factor: Number of batches loaded in advance by each worker. Not applicable (and should not be given) when `num_workers` is 0.
         - num_workers: How many subprocesses to use for data loading. 0 means that the data will be loaded in the main process. Note: when `num_workers` > 1 yielded batches may be shuffled even if `shuffle_buffer_size` is zero.
-        - persistent_workers: If ``True``, the data loader will not shutdown the worker processes after a dataset has been consumed once. This allows to maintain the workers `Dataset` instances alive. (default: ``False``)
+        - persistent_workers: If ``True``, the data loader will not shutdown the worker processes after a dataset has been consumed once. This allows to maintain the workers `Dataset` instances alive, along with their TileDB queries; recommended when iterating for multiple epochs. (default: ``False``)
         - timeout: if positive, the timeout value for collecting a batch from workers. Should always be non-negative. (default: ``0``)
         - drop_last: Set to ``True`` to drop the last incomplete batch, if the dataset size is not divisible by the batch size. If ``False`` and the size of dataset is not divisible by the batch size, then the last batch will be smaller. (default: ``False``)
+        - pin_memory: If ``True``, the data loader will copy Tensors into pinned memory before returning them, so that they can be copied asynchronously to the GPU with ``tensor.to(device, non_blocking=True)``. If `num_workers` is 0, dense batches are collated directly into pinned memory, without an intermediate copy. (default: ``False``)
 
     Users should NOT pass (TileDB-ML either doesn't support or implements internally the corresponding functionality)
     the following arguments: 'shuffle', 'sampler', 'batch_sampler', 'worker_init_fn' and 'collate_fn'.
     """
     is_batched = kwargs.get("batch_size", 1) is not None
+    if shuffle_strategy not in ("buffer", "partitions"):
+        raise ValueError(f"Invalid shuffle_strategy: {shuffle_strategy!r}")
 
     schemas = []
     map_fns = []
@@ -60,7 +93,12 @@ def PyTorchTileDBDataLoader(
         raise ValueError(f"All arrays must have the same key range: {key_range}")
 
     datapipe_for_key_range = partial(
-        _get_unbatched_datapipe, schemas=schemas, map_fns=map_fns
+        _get_unbatched_datapipe,
+        schemas=schemas,
+        map_fns=map_fns,
+        prefetch_buffer_size=prefetch_buffer_size,
+        read_ahead=read_ahead,
+        shuffle_partitions=shuffle_strategy == "partitions",
     )
     num_workers = kwargs.get("num_workers", 0)
     if num_workers:
@@ -84,10 +122,19 @@ def PyTorchTileDBDataLoader(
     # shuffle the unbatched rows if shuffle_buffer_size > 0
     if shuffle_buffer_size:
         # shuffle the datapipe items
-        datapipe = datapipe.shuffle(buffer_size=shuffle_buffer_size)
+        datapipe = DeferredIterableIterDataPipe(
+            _iter_shuffled, datapipe, shuffle_buffer_size
+        )
 
     # construct an appropriate collate function
-    collator = Collator.from_schemas(*schemas)
+    # batches collated by worker processes are moved to shared memory, so collate into
+    # pinned memory only when collating in the main process (and CUDA is available)
+    pin_memory = (
+        bool(kwargs.get("pin_memory")) and not num_workers and torch.cuda.is_available()
+    )
+    collator = Collator.from_schemas(
+        *schemas, pin_memory=pin_memory, float_dtype=float_dtype
+    )
     kwargs["collate_fn"] = collator.collate if is_batched else collator.convert
 
     # return the DataLoader for the final datapipe
@@ -104,6 +151,39 @@ class DeferredIterableIterDataPipe(IterDataPipe):
         return self._callable()
 
 
+def _iter_shuffled(iterable: Iterable[T], buffer_size: int) -> Iterator[T]:
+    """Shuffle the items of an iterable using a buffer of `buffer_size` items.
+
+    Once the buffer is full, every incoming item replaces a random item of the buffer,
+    which is yielded. The random buffer indices are drawn in blocks of `buffer_size`,
+    with one vectorized call per block instead of one call per item. When the iterable
+    is exhausted, the remaining buffer items are yielded in random order.
+    """
+    rng = _get_rng()
+    iterator = iter(iterable)
+    buffer = list(islice(iterator, buffer_size))
+    if len(buffer) == buffer_size:
+        while True:
+            indices = rng.integers(buffer_size, size=buffer_size).tolist()
+            num_replaced = 0
+            # zip stops when `indices` is exhausted without consuming another item
+            for num_replaced, (idx, item) in enumerate(zip(indices, iterator), 1):
+                yield buffer[idx]
+                buffer[idx] = item
+            if num_replaced < buffer_size:
+                break
+    for idx in rng.permutation(len(buffer)).tolist():
+        yield buffer[idx]
+
+
+def _get_rng() -> np.random.Generator:
+    """Return a Numpy random generator seeded from the torch random number generator.
+
+    This makes the generated random numbers reproducible with `torch.manual_seed()`.
+    """
+    return np.random.default_rng(int(torch.empty((), dtype=torch.int64).random_()))
+
+
 def _identity(x: Any) -> Any:
     return x
 
@@ -112,39 +192,98 @@ def _get_unbatched_datapipe(
     key_range: InclusiveRange[Any, int],
     schemas: Sequence[TensorSchema[TensorLike]],
     map_fns: Sequence[Union[Callable, None]],
+    prefetch_buffer_size: int = 0,
+    read_ahead: int = 0,
+    shuffle_partitions: bool = False,
 ) -> IterDataPipe[Union[TensorLikeOrTuple, Tuple[TensorLikeOrTuple, ...]]]:
     """Return a datapipe over unbatched rows for the given schemas and key range.
     If `len(schemas) == 1`, each item of the datapipe is either a single `TensorLike`
     or a sequence of `TensorLike`s, depending on `schemas[0].num_fields`.
     If `len(schemas) > 1`, each item of the datapipe is a tuple of (`TensorLike` or
     sequence of `TensorLike`s, depending on `schema.num_fields`), one for each schema.
+    If `shuffle_partitions` is true, the partitions of the key range are read in a
+    different random order on every iteration.
     """
-    schema_dps = [
-        DeferredIterableIterDataPipe(_unbatch_tensors, schema, key_range).map(
-            map_fns[idx]
-        )
-        if map_fns[idx]
-        else DeferredIterableIterDataPipe(_unbatch_tensors, schema, key_range)
-        for idx, schema in enumerate(schemas)
+    return DeferredIterableIterDataPipe(
+        _iter_unbatched,
+        key_range,
+        schemas,
+        map_fns,
+        prefetch_buffer_size,
+        read_ahead,
+        shuffle_partitions,
+    )
+
+
+def _iter_unbatched(
+    key_range: InclusiveRange[Any, int],
+    schemas: Sequence[TensorSchema[TensorLike]],
+    map_fns: Sequence[Union[Callable, None]],
+    prefetch_buffer_size: int = 0,
+    read_ahead: int = 0,
+    shuffle_partitions: bool = False,
+) -> Iterator[Union[TensorLikeOrTuple, Tuple[TensorLikeOrTuple, ...]]]:
+    # partition the key range using the weights and memory budget of each schema
+    schema_key_ranges = [
+        schema.key_range.subrange(key_range.min, key_range.max) for schema in schemas
     ]
-    dp = schema_dps.pop(0)
-    if schema_dps:
-        dp = dp.zip(*schema_dps)
-    return dp
+    if shuffle_partitions:
+        # all schemas must read the key range in the same order so that their rows are
+        # aligned: shuffle the partitions of the first schema and split each of them
+        # further for every other schema, if needed
+        partitions = tuple(
+            schema_key_ranges[0].partition_by_weight(schemas[0].max_partition_weight)
+        )
+        permutation = _get_rng().permutation(len(partitions)).tolist()
+        shuffled_partitions = tuple(partitions[i] for i in permutation)
+
+    schema_rows = []
+    for schema, schema_key_range, map_fn in zip(schemas, schema_key_ranges, map_fns):
+        max_weight = schema.max_partition_weight
+        key_ranges: Iterable[InclusiveRange[Any, int]]
+        if shuffle_partitions:
+            key_ranges = _iter_subpartitions(
+                schema_key_range, shuffled_partitions, max_weight
+            )
+        else:
+            key_ranges = schema_key_range.partition_by_weight(max_weight)
+        rows = _unbatch_tensors(schema, key_ranges, prefetch_buffer_size, read_ahead)
+        schema_rows.append(map(map_fn, rows) if map_fn else rows)
+    return zip(*schema_rows) if len(schema_rows) > 1 else schema_rows[0]
+
+
+def _iter_subpartitions(
+    key_range: InclusiveRange[Any, int],
+    partitions: Iterable[InclusiveRange[Any, int]],
+    max_weight: int,
+) -> Iterator[InclusiveRange[Any, int]]:
+    """
+    Partition the subrange of `key_range` that corresponds to each of the given
+    partitions into subranges of weight at most `max_weight`.
+    """
+    for partition in partitions:
+        subrange = key_range.subrange(partition.min, partition.max)
+        yield from subrange.partition_by_weight(max_weight)
 
 
 def _unbatch_tensors(
-    schema: TensorSchema[TensorLike], key_range: InclusiveRange[Any, int]
+    schema: TensorSchema[TensorLike],
+    key_ranges: Iterable[InclusiveRange[Any, int]],
+    prefetch_buffer_size: int = 0,
+    read_ahead: int = 0,
 ) -> Iterator[TensorLikeOrTuple]:
     """
-    Generate batches of `TensorLike`s for the given schema and key range and then unbatch
+    Generate batches of `TensorLike`s for the given schema and key ranges and then unbatch
     them into single "rows".
     If `schema.num_fields == 1`, each "row" is a single `TensorLike`
     If `schema.num_fields > 1`, each "row" is a sequence of `TensorLike`s
+    Dense "rows" are views of the respective batch arrays, not copies.
+    If `prefetch_buffer_size > 0`, up to `prefetch_buffer_size` batches are generated
+    ahead in a background thread.
     """
-    batches = schema.iter_tensors(
-        key_range.partition_by_weight(schema.max_partition_weight)
-    )
+    batches = schema.iter_tensors(key_ranges, read_ahead)
+    if prefetch_buffer_size:
+        batches = PrefetchIterator(batches, prefetch_buffer_size)
     if schema.num_fields > 1:
         # convert batches of columns to batches of rows
         batches = (zip(*batch) for batch in batches)
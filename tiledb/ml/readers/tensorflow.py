@@ -1,13 +1,14 @@
 """Functionality for loading data from TileDB arrays to the Tensorflow Data API."""
 
-from functools import singledispatch
-from typing import Sequence, Union
+from functools import partial, singledispatch
+from typing import Iterable, Sequence, Union
 
 import numpy as np
 import scipy.sparse
 import sparse
 import tensorflow as tf
 
+from ._prefetch import PrefetchIterator
 from ._tensor_schema import MappedTensorSchema, RaggedArray, SparseArray, TensorSchema
 from .types import ArrayParams, TensorKind
 
@@ -17,6 +18,8 @@ Tensor = Union[np.ndarray, tf.SparseTensor]
 def TensorflowTileDBDataset(
     *all_array_params: ArrayParams,
     num_workers: int = 0,
+    prefetch_buffer_size: int = 2,
+    read_ahead: int = 0,
 ) -> tf.data.Dataset:
     """
     Return a tf.data.Dataset for loading data from TileDB arrays.
@@ -24,6 +27,11 @@ def TensorflowTileDBDataset(
     :param all_array_params: One or more `ArrayParams` instances, one per TileDB array.
     :param num_workers: If greater than zero, create a threadpool of `num_workers` threads
         used to fetch inputs asynchronously and in parallel.
+    :param prefetch_buffer_size: Number of batches read ahead from each TileDB array
+        in a background thread, overlapping I/O with computation. 0 disables prefetching.
+    :param read_ahead: Number of TileDB reads issued concurrently ahead of the current
+        one. Useful for storage backends that serve concurrent requests efficiently
+        (e.g. S3); it increases the memory footprint proportionally. 0 disables it.
     """
     schemas = []
     for array_params in all_array_params:
@@ -43,12 +51,19 @@ def TensorflowTileDBDataset(
     max_weights = tuple(schema.max_partition_weight for schema in schemas)
     key_subranges = tuple(key_range.partition_by_count(num_workers or 1))
 
+    def iter_tensors(
+        schema: TensorSchema[Tensor], max_weight: int, key_range_idx: int
+    ) -> Iterable[Union[Tensor, Sequence[Tensor]]]:
+        key_ranges = key_subranges[key_range_idx].partition_by_weight(max_weight)
+        tensors = schema.iter_tensors(key_ranges, read_ahead)
+        if prefetch_buffer_size:
+            tensors = PrefetchIterator(tensors, prefetch_buffer_size)
+        return tensors
+
     def key_range_dataset(key_range_idx: int) -> tf.data.Dataset:
         datasets = tuple(
             tf.data.Dataset.from_generator(
-                lambda i, schema=schema, max_weight=max_weight: schema.iter_tensors(
-                    key_subranges[i].partition_by_weight(max_weight)
-                ),
+                partial(iter_tensors, schema, max_weight),
                 args=(key_range_idx,),
                 output_signature=_get_tensor_specs(schema),
             ).unbatch()
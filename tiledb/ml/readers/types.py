@@ -44,8 +44,14 @@ class ArrayParams:
     _tensor_schema_kwargs: Mapping[str, Any] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        all_attrs = [self.array.attr(i).name for i in range(self.array.nattr)]
-        all_dims = [self.array.dim(i).name for i in range(self.array.ndim)]
+        # look up the array schema and domain once instead of once per attr/dim
+        schema = self.array.schema
+        domain = schema.domain
+        all_attrs = [schema.attr(i).name for i in range(schema.nattr)]
+        dim_dtypes = {
+            dim.name: dim.dtype for dim in map(domain.dim, range(domain.ndim))
+        }
+        all_dims = list(dim_dtypes)
         dims = []
 
         if self.fields:
@@ -95,10 +101,10 @@ class ArrayParams:
 
         if self.tensor_kind is not None:
             tensor_kind = self.tensor_kind
-        elif not self.array.schema.sparse:
+        elif not schema.sparse:
             tensor_kind = TensorKind.DENSE
         elif not all(
-            np.issubdtype(self.array.dim(dim).dtype, np.integer) for dim in all_dims[1:]
+            np.issubdtype(dim_dtypes[dim], np.integer) for dim in all_dims[1:]
         ):
             tensor_kind = TensorKind.RAGGED
         else: